@@ -1,104 +1,300 @@
 """
 Agent implementations for the autonomous development system
 """
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional, Sequence, Tuple
 from langchain_core.agents import AgentFinish
+from langchain_core.messages import BaseMessage, BaseMessageChunk, HumanMessage, SystemMessage
 from langchain_core.tools import BaseTool
 from langchain_openai import ChatOpenAI
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import Runnable, RunnableConfig
 from langgraph.prebuilt import ToolExecutor, ToolInvocation
 from langgraph.graph import END
-from .state import State, AgentType
-from .prompts import INITIALIZER_AGENT_PROMPT, CODER_AGENT_PROMPT
+from .state import State, AgentType, Feature
+from .prompts import (
+    INITIALIZER_SYSTEM_PROMPT,
+    CODER_SYSTEM_PROMPT,
+    INITIALIZER_AGENT_PROMPT,
+    CODER_AGENT_PROMPT,
+    CODER_CONTEXT_PROMPT,
+)
 from .config import Config
-import json
+from .tools import FileReadTool, FileWriteTool, GitTool, invalidate_file_cache
+import asyncio
 import logging
+import os
+import subprocess
+import time
+import orjson
 
 logger = logging.getLogger(__name__)
 
-class DevelopmentAgent:
+# (LLM settings, tool names) -> (llm, llm_with_tools), shared by every agent with the same setup
+_LLM_CACHE: Dict[tuple, Tuple[ChatOpenAI, Runnable]] = {}
+
+def _get_llm(config: Config, tools: Sequence[BaseTool]) -> Tuple[ChatOpenAI, Runnable]:
     """
-    Base class for development agents (Initializer and Coder)
+    Get the LLM client and its tool-bound runnable, creating them on first use.
+    Agents with the same LLM settings and tool set reuse one client (and its
+    connection pool) and one set of bound tool schemas.
     """
-    def __init__(self, config: Config, tools: List[BaseTool]):
-        self.config = config
-        self.tools = tools
-        self.tool_executor = ToolExecutor(tools)
-        
+    key = (
+        config.llm_model_name,
+        config.llm_temperature,
+        config.llm_max_tokens,
+        config.llm_base_url,
+        config.llm_api_key,
+        tuple(sorted(t.name for t in tools)),
+    )
+    cached = _LLM_CACHE.get(key)
+    if cached is None:
         # Initialize the LLM - configured for local 20B model
-        self.llm = ChatOpenAI(
+        llm = ChatOpenAI(
             model=config.llm_model_name,
             temperature=config.llm_temperature,
             max_tokens=config.llm_max_tokens,
-            base_url="http://localhost:1234/v1",  # Default LM Studio endpoint
-            api_key="dummy-key"  # Not needed for local models
+            base_url=config.llm_base_url,
+            api_key=config.llm_api_key
         )
-        
-        # Bind tools to LLM
-        self.llm_with_tools = self.llm.bind_tools(tools)
+        # Bind tools to LLM once, so the tool schemas sent with every request stay identical
+        cached = _LLM_CACHE[key] = (llm, llm.bind_tools(tools))
+    return cached
+
+def write_file_atomic(path: str, payload: bytes):
+    """Write bytes to a temp file and rename it over `path`, so readers never see a partial file"""
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    invalidate_file_cache(path)
+
+async def batched_stream(
+    chunks: AsyncIterator[BaseMessageChunk], max_tokens: int = 20, max_ms: float = 50
+) -> AsyncIterator[BaseMessageChunk]:
+    """
+    Merge streamed LLM chunks, yielding once every `max_tokens` chunks or `max_ms`
+    milliseconds instead of once per token. The time limit is a deadline: buffered
+    chunks are flushed when it passes even if the stream stalls (e.g. during a tool call)
+    """
+    iterator = chunks.__aiter__()
+    pending: Optional[BaseMessageChunk] = None
+    count = 0
+    deadline = 0.0
+    # The next chunk is fetched in a task, so waiting for it can time out without
+    # cancelling (and so closing) the underlying stream
+    next_chunk: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(iterator.__anext__())
+            if pending is not None:
+                done, _ = await asyncio.wait((next_chunk,), timeout=max(0.0, deadline - time.monotonic()))
+                if not done:
+                    yield pending
+                    pending = None
+                    continue
+            try:
+                chunk = await next_chunk
+            except StopAsyncIteration:
+                break
+            next_chunk = None
+            if pending is None:
+                pending = chunk
+                count = 1
+                deadline = time.monotonic() + max_ms / 1000
+            else:
+                pending = pending + chunk
+                count += 1
+            if count >= max_tokens or time.monotonic() >= deadline:
+                yield pending
+                pending = None
+    finally:
+        # The consumer stopped early - don't leave a fetch running
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
+    if pending is not None:
+        yield pending
+
+class DevelopmentAgent:
+    """
+    Base class for development agents (Initializer and Coder)
+    """
+    # Constant system prompt, overridden by each agent and shared by all its instances
+    system_message: SystemMessage = SystemMessage(content="")
+    
+    def __init__(self, config: Config, tools: Sequence[BaseTool], tool_executor: Optional[ToolExecutor] = None):
+        self.config = config
+        self.tools: Tuple[BaseTool, ...] = tuple(tools)
+        self._tools_by_name: Dict[str, BaseTool] = {t.name: t for t in tools}
+        self._tools_by_type: Dict[type, BaseTool] = {type(t): t for t in tools}
+        # (commit message, process) for git commits still running in the background
+        self._pending_git: List[Tuple[str, subprocess.Popen]] = []
+        # Reuse the workflow's executor when given one instead of building one per agent
+        self.tool_executor = tool_executor or ToolExecutor(self.tools)
+        self.llm, self.llm_with_tools = _get_llm(config, self.tools)
+    
+    def _build_messages(self, context: str) -> List[BaseMessage]:
+        """
+        Build the messages for an LLM call. The constant system prompt always comes
+        first so the server's prefix cache can reuse it across every call.
+        """
+        return [self.system_message, HumanMessage(content=context)]
     
     def get_bearings(self, state: State) -> State:
         """
         Perform the 'Get Your Bearings' routine to orient the agent
         """
+        return asyncio.run(self.aget_bearings(state))
+    
+    async def aget_bearings(self, state: State) -> State:
+        """
+        Async 'Get Your Bearings' routine - the independent reads run concurrently
+        """
         logger.info("Performing 'Get Your Bearings' routine...")
         
+        # Make sure the last session's commit has landed before reading git history
+        await asyncio.to_thread(self.wait_for_git, state)
+        
         # Add project directory context
         state.add_progress_log("Starting bearings routine")
         
-        # Read app spec if not already loaded
-        if not state.app_spec:
-            try:
-                from .tools import FileReadTool
-                # Find the FileReadTool from our tools
-                file_read_tool = next((tool for tool in self.tools if isinstance(tool, FileReadTool)), None)
-                if file_read_tool:
-                    app_spec_content = file_read_tool._run(self.config.app_spec_file)
-                    state.app_spec = app_spec_content
-                    state.add_progress_log(f"Loaded app spec from {self.config.app_spec_file}")
-            except Exception as e:
-                state.add_progress_log(f"Could not read app spec: {str(e)}")
+        # Run all reads concurrently, then merge into state one at a time
+        tasks = [
+            self._read_spec(state),
+            self._read_features(state),
+            self._read_progress(state),
+            self._git_log(),
+        ]
+        app_spec_content, feature_list_content, progress_content, git_log = await asyncio.gather(
+            *tasks, return_exceptions=True
+        )
         
-        # Read feature list if not already loaded
-        if not state.feature_list:
-            try:
-                from .tools import FileReadTool
-                file_read_tool = next((tool for tool in self.tools if isinstance(tool, FileReadTool)), None)
-                if file_read_tool:
-                    feature_list_content = file_read_tool._run(self.config.feature_list_file)
-                    state.load_feature_list_from_json(feature_list_content)
-                    state.add_progress_log(f"Loaded feature list with {state.total_features} features")
-            except Exception as e:
-                state.add_progress_log(f"Could not read feature list: {str(e)}")
+        if isinstance(app_spec_content, BaseException):
+            state.add_progress_log(f"Could not read app spec: {str(app_spec_content)}")
+        elif app_spec_content is not None:
+            state.app_spec = app_spec_content
+            state.add_progress_log(f"Loaded app spec from {self.config.app_spec_file}")
         
-        # Read progress log
-        try:
-            from .tools import FileReadTool
-            file_read_tool = next((tool for tool in self.tools if isinstance(tool, FileReadTool)), None)
-            if file_read_tool:
-                progress_content = file_read_tool._run(self.config.progress_file)
-                state.progress_log.extend(progress_content.split('\n'))
-        except Exception as e:
-            state.add_progress_log(f"Could not read progress log: {str(e)}")
+        if isinstance(feature_list_content, BaseException):
+            state.add_progress_log(f"Could not read feature list: {str(feature_list_content)}")
+        elif feature_list_content is not None:
+            state.load_feature_list_from_json(feature_list_content)
+            state.add_progress_log(f"Loaded feature list with {state.total_features} features")
         
-        # Get git history
-        try:
-            from .tools import GitTool
-            git_tool = next((tool for tool in self.tools if isinstance(tool, GitTool)), None)
-            if git_tool:
-                git_log = git_tool._run("log", n=5)
-                state.git_history = git_log.split('\n')
-        except Exception as e:
-            state.add_progress_log(f"Could not get git history: {str(e)}")
+        if isinstance(progress_content, BaseException):
+            state.add_progress_log(f"Could not read progress log: {str(progress_content)}")
+        elif progress_content is not None:
+            new_lines, state.progress_file_offset = progress_content
+            state.progress_log_raw.extend((None, line) for line in new_lines)
+        
+        if isinstance(git_log, BaseException):
+            state.add_progress_log(f"Could not get git history: {str(git_log)}")
+        elif git_log is not None:
+            state.git_history = git_log.split('\n')
         
         return state
     
+    async def _read_project_file(self, filepath: str) -> Optional[str]:
+        """Read a project file with the FileReadTool in a worker thread"""
+        file_read_tool = self._tools_by_type.get(FileReadTool)
+        if not file_read_tool:
+            return None
+        return await asyncio.to_thread(file_read_tool._run, filepath)
+    
+    async def _read_spec(self, state: State) -> Optional[str]:
+        """Read the app spec if not already loaded"""
+        if state.app_spec:
+            return None
+        return await self._read_project_file(self.config.app_spec_file)
+    
+    async def _read_features(self, state: State) -> Optional[str]:
+        """Read the feature list if not already loaded"""
+        if state.feature_list:
+            return None
+        return await self._read_project_file(self.config.feature_list_file)
+    
+    async def _read_progress(self, state: State) -> Optional[Tuple[List[str], int]]:
+        """Read the lines appended to the progress log since the last read, and the new offset"""
+        return await asyncio.to_thread(self._read_progress_tail, state.progress_file_offset)
+    
+    def _read_progress_tail(self, offset: int) -> Optional[Tuple[List[str], int]]:
+        """
+        Read the complete lines of the progress log from `offset` onwards. A trailing
+        partial line is left for the next read, so it is never split into two entries
+        """
+        path = os.path.join(self.config.project_dir, self.config.progress_file)
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < offset:
+                    # The log was truncated or replaced - start over
+                    offset = 0
+                f.seek(offset)
+                new = f.read()
+                complete = new[:new.rfind(b'\n') + 1]
+                return complete.decode('utf-8', 'replace').splitlines(), offset + len(complete)
+        except FileNotFoundError:
+            # No previous session has written a progress log yet
+            return None
+    
+    async def _git_log(self) -> Optional[str]:
+        """Get the last few commits from git history"""
+        git_tool = self._tools_by_type.get(GitTool)
+        if not git_tool:
+            return None
+        return await asyncio.to_thread(git_tool._run, "log", n=5)
+    
+    def start_git_commit(self, state: State, message: str):
+        """
+        Stage every change, new files included, and commit it - both in one background
+        process, so git stays off the coder's critical path. Does nothing when the agent
+        has no GitTool.
+        """
+        git_tool = self._tools_by_type.get(GitTool)
+        if not git_tool:
+            return
+        
+        # A commit still running holds .git/index.lock - let it finish first
+        self.wait_for_git(state)
+        
+        repo_path = self.config.project_dir
+        # Initializes the repository on first use, like any other GitTool operation
+        git_tool._get_repo(repo_path)
+        
+        # The message is passed as $1, never interpolated into the script
+        process = subprocess.Popen(
+            ["sh", "-c", 'git add -A && git commit -q -m "$1"', "sh", message],
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        )
+        self._pending_git.append((message, process))
+    
+    def wait_for_git(self, state: Optional[State] = None):
+        """Wait for background git commits to finish and log their results"""
+        while self._pending_git:
+            message, process = self._pending_git.pop(0)
+            output, _ = process.communicate()
+            if process.returncode == 0:
+                result = f"Committed with message: {message}"
+            else:
+                result = f"Git operation failed: {output.strip()}"
+            
+            if state is not None:
+                state.add_progress_log(f"Git commit result: {result}")
+            else:
+                logger.info(f"Git commit result: {result}")
+    
     def run_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
         """
         Execute a tool with the given input
         """
         # Find the tool
-        tool = next((t for t in self.tools if t.name == tool_name), None)
+        tool = self._tools_by_name.get(tool_name)
         if not tool:
             return f"Error: Tool {tool_name} not found"
         
@@ -114,7 +310,7 @@ class DevelopmentAgent:
         Async execution of a tool
         """
         # Find the tool
-        tool = next((t for t in self.tools if t.name == tool_name), None)
+        tool = self._tools_by_name.get(tool_name)
         if not tool:
             return f"Error: Tool {tool_name} not found"
         
@@ -132,8 +328,10 @@ class InitializerAgent(DevelopmentAgent):
     """
     Initializer agent that sets up the project foundation
     """
-    def __init__(self, config: Config, tools: List[BaseTool]):
-        super().__init__(config, tools)
+    system_message = SystemMessage(content=INITIALIZER_SYSTEM_PROMPT)
+    
+    def __init__(self, config: Config, tools: Sequence[BaseTool], tool_executor: Optional[ToolExecutor] = None):
+        super().__init__(config, tools, tool_executor)
         self.agent_type: AgentType = "initializer"
     
     def plan_initialization(self, state: State) -> State:
@@ -172,9 +370,8 @@ class InitializerAgent(DevelopmentAgent):
         # Create feature_list.json if it doesn't exist
         if not state.feature_list:
             try:
-                from .tools import FileReadTool, FileWriteTool
-                file_read_tool = next((tool for tool in self.tools if isinstance(tool, FileReadTool)), None)
-                file_write_tool = next((tool for tool in self.tools if isinstance(tool, FileWriteTool)), None)
+                file_read_tool = self._tools_by_type.get(FileReadTool)
+                file_write_tool = self._tools_by_type.get(FileWriteTool)
                 
                 if file_read_tool and file_write_tool and state.app_spec:
                     # Generate a basic feature list based on the app spec
@@ -221,33 +418,17 @@ class InitializerAgent(DevelopmentAgent):
         
         # Create init.sh if it doesn't exist
         try:
-            from .tools import FileWriteTool
-            file_write_tool = next((tool for tool in self.tools if isinstance(tool, FileWriteTool)), None)
+            file_write_tool = self._tools_by_type.get(FileWriteTool)
             
             if file_write_tool:
-                init_script_content = f"""#!/bin/bash
-# Initialization script for the project
-echo "Starting development environment..."
-
-# Start frontend
-echo "Starting frontend on port {self.config.frontend_port}..."
-cd frontend && npm run dev &
-
-# Start backend  
-echo "Starting backend on port {self.config.backend_port}..."
-cd server && npm run start &
-
-echo "Environment started. Frontend: http://localhost:{self.config.frontend_port}, Backend: http://localhost:{self.config.backend_port}"
-"""
-                result = file_write_tool._run(self.config.init_script_file, init_script_content)
+                result = file_write_tool._run(self.config.init_script_file, self.config.init_script_content)
                 state.add_progress_log(f"Created init.sh: {result}")
         except Exception as e:
             state.add_progress_log(f"Error creating init.sh: {str(e)}")
         
         # Initialize git repo
         try:
-            from .tools import GitTool
-            git_tool = next((tool for tool in self.tools if isinstance(tool, GitTool)), None)
+            git_tool = self._tools_by_type.get(GitTool)
             
             if git_tool:
                 result = git_tool._run("add", files=".")
@@ -265,8 +446,10 @@ class CoderAgent(DevelopmentAgent):
     """
     Coder agent that implements features from the feature list
     """
-    def __init__(self, config: Config, tools: List[BaseTool]):
-        super().__init__(config, tools)
+    system_message = SystemMessage(content=CODER_SYSTEM_PROMPT)
+    
+    def __init__(self, config: Config, tools: Sequence[BaseTool], tool_executor: Optional[ToolExecutor] = None):
+        super().__init__(config, tools, tool_executor)
         self.agent_type: AgentType = "coder"
     
     def plan_coding_session(self, state: State) -> State:
@@ -285,7 +468,7 @@ class CoderAgent(DevelopmentAgent):
         next_feature = state.get_next_incomplete_feature()
         
         if next_feature:
-            state.current_feature_id = next_feature.id or next_feature.description[:20]
+            state.current_feature_id = next_feature.key
             state.current_feature_description = next_feature.description
             state.current_feature_steps = next_feature.steps
             state.current_task = f"Implement feature: {next_feature.description}"
@@ -297,6 +480,36 @@ class CoderAgent(DevelopmentAgent):
         
         return state
     
+    async def plan_next_batch(self, state: State, batch_size: Optional[int] = None) -> List[Tuple[Feature, BaseMessage]]:
+        """
+        Plan the next few incomplete features with a single batched LLM call
+        """
+        features = state.get_incomplete_features(batch_size or self.config.feature_batch_size)
+        if not features:
+            return []
+        
+        logger.info(f"Planning batch of {len(features)} features...")
+        
+        feature_summary = "\n".join(
+            f"- [{'x' if f.passes else ' '}] {f.description}" for f in state.feature_list
+        )
+        prompts = [
+            self._build_messages(CODER_CONTEXT_PROMPT.format(
+                app_spec=state.app_spec,
+                feature_list=feature_summary,
+                progress_log="\n".join(state.get_progress_log(last=20)),
+                git_history="\n".join(state.git_history),
+                current_task=f"Implement feature: {f.description}\n" + "\n".join(f.steps),
+            ))
+            for f in features
+        ]
+        outputs = await self.llm_with_tools.abatch(
+            prompts, config={"max_concurrency": self.config.max_concurrency}
+        )
+        
+        state.add_progress_log(f"Planned {len(features)} features in one batch")
+        return list(zip(features, outputs))
+    
     def execute_coding_task(self, state: State) -> State:
         """
         Execute the current coding task
@@ -313,51 +526,50 @@ class CoderAgent(DevelopmentAgent):
         
         # After completing the feature, update the feature_list.json
         try:
-            from .tools import FileReadTool, FileWriteTool
-            file_read_tool = next((tool for tool in self.tools if isinstance(tool, FileReadTool)), None)
-            file_write_tool = next((tool for tool in self.tools if isinstance(tool, FileWriteTool)), None)
+            file_read_tool = self._tools_by_type.get(FileReadTool)
             
-            if file_read_tool and file_write_tool:
+            if file_read_tool:
                 # Read current feature list
                 feature_list_content = file_read_tool._run(self.config.feature_list_file)
                 
                 # Parse and update the specific feature
-                feature_list = json.loads(feature_list_content)
+                feature_list = orjson.loads(feature_list_content)
                 
                 for feature in feature_list:
-                    if (feature.get('id') == state.current_feature_id or 
-                        feature.get('description', '').startswith(state.current_feature_description[:50])):
+                    if (feature.get('id') or feature.get('description')) == state.current_feature_id:
                         feature['passes'] = True
                         break
+                else:
+                    feature = None
                 
-                # Write updated feature list back
-                updated_content = json.dumps(feature_list, indent=2)
-                result = file_write_tool._run(self.config.feature_list_file, updated_content)
-                state.add_progress_log(f"Updated feature_list.json: {result}")
-                
-                # Update state
-                state.load_feature_list_from_json(updated_content)
-                state.mark_feature_complete(state.current_feature_id or state.current_feature_description)
-                
-                # Add to progress log
-                completion_msg = f"Completed feature: {state.current_feature_description}"
-                state.add_progress_log(completion_msg)
-                state.add_progress_log(f"Progress: {state.get_completion_percentage():.1f}% ({state.completed_features}/{state.total_features})")
+                if feature is None:
+                    # Leave both the file and the in-memory state alone, so the next
+                    # reload still sees them disagree
+                    state.add_progress_log(
+                        f"Feature {state.current_feature_id!r} not found in feature_list.json, not marking it complete"
+                    )
+                else:
+                    # Write updated feature list back - the file already exists, so skip the
+                    # FileWriteTool and swap it in with a single write + rename
+                    payload = orjson.dumps(feature_list, option=orjson.OPT_INDENT_2)
+                    write_file_atomic(os.path.join(self.config.project_dir, self.config.feature_list_file), payload)
+                    state.add_progress_log(f"Updated feature_list.json: wrote {len(payload)} bytes")
+                    
+                    # Update state in place - no need to re-parse what we just wrote
+                    state.mark_feature_complete(state.current_feature_id)
+                    state.mark_feature_list_synced(payload)
+                    
+                    # Add to progress log
+                    completion_msg = f"Completed feature: {state.current_feature_description}"
+                    state.add_progress_log(completion_msg)
+                    state.add_progress_log(f"Progress: {state.get_completion_percentage():.1f}% ({state.completed_features}/{state.total_features})")
         except Exception as e:
             state.add_progress_log(f"Error updating feature_list.json: {str(e)}")
         
-        # Commit changes
+        # Commit changes in the background - the next bearings routine waits for it
         try:
-            from .tools import GitTool
-            git_tool = next((tool for tool in self.tools if isinstance(tool, GitTool)), None)
-            
-            if git_tool:
-                result = git_tool._run("add", files=".")
-                state.add_progress_log(f"Git add result: {result}")
-                
-                commit_msg = f"Implement {state.current_feature_description[:50]}... - verified end-to-end"
-                result = git_tool._run("commit", message=commit_msg)
-                state.add_progress_log(f"Git commit result: {result}")
+            commit_msg = f"Implement {state.current_feature_description[:50]}... - verified end-to-end"
+            self.start_git_commit(state, commit_msg)
         except Exception as e:
             state.add_progress_log(f"Error with git commit: {str(e)}")
         
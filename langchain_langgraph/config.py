@@ -3,17 +3,52 @@ Configuration for the Langgraph-based autonomous development system
 """
 import os
 from dataclasses import dataclass
-from typing import Optional
+from functools import cached_property
+from pathlib import Path
+from typing import Literal, Optional
 
-@dataclass
+LLMEngine = Literal["vllm", "lmstudio", "openai"]
+
+# OpenAI-compatible endpoint for each supported serving engine.
+# vLLM is moved off its default port 8000 so it doesn't clash with backend_port.
+DEFAULT_LLM_BASE_URLS = {
+    "vllm": "http://localhost:8001/v1",
+    "lmstudio": "http://localhost:1234/v1",
+    "openai": "https://api.openai.com/v1",
+}
+
+INIT_SCRIPT_TEMPLATE = """#!/bin/bash
+# Initialization script for the project
+echo "Starting development environment..."
+
+# Start frontend
+echo "Starting frontend on port {frontend_port}..."
+cd frontend && npm run dev &
+
+# Start backend  
+echo "Starting backend on port {backend_port}..."
+cd server && npm run start &
+
+echo "Environment started. Frontend: http://localhost:{frontend_port}, Backend: http://localhost:{backend_port}"
+"""
+
+@dataclass(frozen=True)
 class Config:
-    """Configuration for the autonomous development system"""
+    """
+    Configuration for the autonomous development system.
+    Immutable - use dataclasses.replace() to derive a modified copy.
+    """
     
     # LLM Configuration - Optimized for 20B parameter local model
     llm_model_name: str = "local-20b-model"  # Placeholder for local model
     llm_temperature: float = 0.1  # Lower temperature for more consistent outputs
     llm_max_tokens: int = 2048
     llm_context_window: int = 8192  # Context window for the 20B model
+    # vLLM batches concurrent agent requests (LM Studio serves one at a time). Launch it with
+    # --enable-prefix-caching: every request starts with the same agent system prompt.
+    llm_engine: LLMEngine = "vllm"
+    llm_base_url: Optional[str] = None  # Defaults to the engine's endpoint in DEFAULT_LLM_BASE_URLS
+    llm_api_key: str = "dummy-key"  # Not needed for local models
     
     # File paths and state management
     project_dir: str = "./project"
@@ -26,6 +61,8 @@ class Config:
     # Agent configuration
     max_attempts_per_feature: int = 50  # Prevent infinite loops
     max_session_tokens: int = 4000  # Reserve context for system messages
+    feature_batch_size: int = 4  # Features planned per batched LLM call
+    max_concurrency: int = 4  # Concurrent requests within a batch
     
     # Development environment
     frontend_port: int = 3000
@@ -35,6 +72,30 @@ class Config:
     browser_headless: bool = True
     screenshot_dir: str = "screenshots"
     
+    def __post_init__(self):
+        if self.llm_base_url is None:
+            # Only engines with a known local endpoint can run without an explicit URL
+            if self.llm_engine not in DEFAULT_LLM_BASE_URLS:
+                raise ValueError(
+                    f"Unknown LLM engine {self.llm_engine!r}: set llm_base_url (LLM_BASE_URL) "
+                    f"or use one of {', '.join(DEFAULT_LLM_BASE_URLS)}"
+                )
+            # Frozen dataclass - bypass the generated __setattr__
+            object.__setattr__(self, 'llm_base_url', DEFAULT_LLM_BASE_URLS[self.llm_engine])
+    
+    @cached_property
+    def project_root(self) -> Path:
+        """The project directory as a Path, parsed once"""
+        return Path(self.project_dir)
+    
+    @cached_property
+    def init_script_content(self) -> str:
+        """The init.sh body with the configured ports filled in, rendered once"""
+        return INIT_SCRIPT_TEMPLATE.format(
+            frontend_port=self.frontend_port,
+            backend_port=self.backend_port,
+        )
+    
     @classmethod
     def from_env(cls) -> 'Config':
         """Create config from environment variables"""
@@ -43,8 +104,13 @@ class Config:
             llm_temperature=float(os.getenv('LLM_TEMPERATURE', '0.1')),
             llm_max_tokens=int(os.getenv('LLM_MAX_TOKENS', '2048')),
             llm_context_window=int(os.getenv('LLM_CONTEXT_WINDOW', '8192')),
+            llm_engine=os.getenv('LLM_ENGINE', 'vllm'),
+            llm_base_url=os.getenv('LLM_BASE_URL'),
+            llm_api_key=os.getenv('LLM_API_KEY', 'dummy-key'),
             project_dir=os.getenv('PROJECT_DIR', './project'),
             frontend_port=int(os.getenv('FRONTEND_PORT', '3000')),
             backend_port=int(os.getenv('BACKEND_PORT', '8000')),
             max_attempts_per_feature=int(os.getenv('MAX_ATTEMPTS_PER_FEATURE', '50')),
+            feature_batch_size=int(os.getenv('FEATURE_BATCH_SIZE', '4')),
+            max_concurrency=int(os.getenv('MAX_CONCURRENCY', '4')),
         )
\ No newline at end of file
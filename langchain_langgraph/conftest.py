@@ -0,0 +1,58 @@
+"""
+Shared pytest configuration for the Langgraph system tests.
+"""
+import os
+import shutil
+
+import pytest
+
+from langchain_langgraph.config import Config
+
+
+def default_worker_count() -> int:
+    """
+    Number of test workers: leave two cores free for the agent's LLM server.
+    """
+    return max(1, (os.cpu_count() or 1) - 2)
+
+
+def pytest_xdist_auto_num_workers(config):
+    """
+    Make `-n auto` (see pytest.ini) use cores-2 instead of every core.
+    """
+    return default_worker_count()
+
+
+@pytest.fixture(scope="class")
+def class_test_dir(request, tmp_path_factory):
+    """
+    One temporary project directory per test class, exposed as `self.test_dir`.
+    """
+    test_dir = tmp_path_factory.mktemp(request.cls.__name__ if request.cls else "tests")
+    if request.cls is not None:
+        request.cls.test_dir = str(test_dir)
+    yield str(test_dir)
+    shutil.rmtree(test_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="class")
+def class_git_repo(class_test_dir):
+    """
+    Initialize a git repository in the class directory once, on a fixed branch name.
+    """
+    import git
+    
+    return git.Repo.init(class_test_dir, initial_branch="main")
+
+
+@pytest.fixture(scope="class")
+def class_config(request, class_test_dir):
+    """
+    One Config per test class for the class directory, exposed as `self.config`.
+    Config is frozen, so tests needing other settings derive a copy with
+    dataclasses.replace instead of mutating the shared one.
+    """
+    config = Config(project_dir=class_test_dir)
+    if request.cls is not None:
+        request.cls.config = config
+    return config
@@ -315,10 +315,26 @@ leave the code base in a clean state before terminating the session (Step 10).
 Begin by running Step 1 (Get Your Bearings).
 """
 
+# System prompts with the template escapes resolved, rendered once at import
+INITIALIZER_SYSTEM_PROMPT = PromptTemplate.from_template(INITIALIZER_PROMPT).format()
+CODER_SYSTEM_PROMPT = PromptTemplate.from_template(CODER_PROMPT).format()
+
+# Per-call context appended after each agent's system prompt
+INITIALIZER_CONTEXT = """CURRENT TASK: {current_task}
+APP SPECIFICATION: {app_spec}"""
+
+CODER_CONTEXT = """APP SPECIFICATION: {app_spec}
+CURRENT FEATURE LIST: {feature_list}
+PROGRESS LOG: {progress_log}
+GIT HISTORY (last 5): {git_history}
+
+CURRENT TASK: {current_task}
+"""
+
 # Template for the initializer agent
 INITIALIZER_AGENT_PROMPT = PromptTemplate(
     input_variables=["app_spec", "current_task"],
-    template=INITIALIZER_PROMPT + "\n\nCURRENT TASK: {current_task}\nAPP SPECIFICATION: {app_spec}"
+    template=INITIALIZER_PROMPT + "\n\n" + INITIALIZER_CONTEXT
 )
 
 # Template for the coder agent  
@@ -326,11 +342,11 @@ CODER_AGENT_PROMPT = PromptTemplate(
     input_variables=["app_spec", "feature_list", "progress_log", "git_history", "current_task"],
     template=CODER_PROMPT + """
     
-APP SPECIFICATION: {app_spec}
-CURRENT FEATURE LIST: {feature_list}
-PROGRESS LOG: {progress_log}
-GIT HISTORY (last 5): {git_history}
+""" + CODER_CONTEXT
+)
 
-CURRENT TASK: {current_task}
-"""
-)
\ No newline at end of file
+# Context-only template, sent as the human message after the constant coder system prompt
+CODER_CONTEXT_PROMPT = PromptTemplate(
+    input_variables=["app_spec", "feature_list", "progress_log", "git_history", "current_task"],
+    template=CODER_CONTEXT
+)
@@ -1,15 +1,19 @@
 """
 State management for the autonomous development system
 """
-from typing import Dict, List, Optional, Any, Literal
+from typing import Deque, Dict, List, Optional, Any, Literal, Tuple, Union
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
 from datetime import datetime
-import json
+import hashlib
+import time
+import orjson
 
 # Define the possible agent types
 AgentType = Literal["initializer", "coder"]
 
-@dataclass
+@dataclass(slots=True)
 class Feature:
     """Represents a single feature/test in the feature list"""
     category: str  # e.g., "functional", "style"
@@ -17,9 +21,47 @@ class Feature:
     steps: List[str]
     passes: bool = False
     id: Optional[str] = None
+    
+    @property
+    def key(self) -> str:
+        """Stable identifier - the explicit id, or the description when none is set"""
+        return self.id or self.description
+
+def _content_hash(content: Union[str, bytes]) -> bytes:
+    """Fast digest used to detect an unchanged feature list"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+def _reuse_feature(existing: Optional[Feature], feature_dict: Dict[str, Any]) -> Feature:
+    """Return `existing` if it matches the JSON entry exactly, otherwise build a new Feature"""
+    if (existing is not None
+            and existing.passes == feature_dict.get('passes', False)
+            and existing.id == feature_dict.get('id')
+            and existing.description == feature_dict.get('description')
+            and existing.category == feature_dict.get('category')
+            and existing.steps == feature_dict.get('steps')):
+        return existing
+    return Feature(**feature_dict)
+
+def _format_progress_entry(timestamp_ns: Optional[int], message: str) -> str:
+    """Format a raw progress log entry as '[isoformat timestamp] message'"""
+    if timestamp_ns is None:
+        return message
+    seconds, nanos = divmod(timestamp_ns, 1_000_000_000)
+    timestamp = datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000)
+    return f"[{timestamp.isoformat()}] {message}"
+
+class _FeatureIndexSlots:
+    """
+    Storage for State's derived feature indexes. They are declared here, outside
+    the dataclass fields, so LangGraph does not turn them into state channels -
+    State rebuilds them from feature_list whenever it is constructed.
+    """
+    __slots__ = ('_by_id', '_incomplete')
 
-@dataclass
-class State:
+@dataclass(slots=True)
+class State(_FeatureIndexSlots):
     """
     State for the autonomous development system
     This state is managed by LangGraph to maintain context between agent calls
@@ -32,7 +74,13 @@ class State:
     project_dir: str = "./project"
     app_spec: str = ""
     feature_list: List[Feature] = field(default_factory=list)
-    progress_log: List[str] = field(default_factory=list)
+    # Digest of the feature_list.json content the in-memory list currently matches.
+    # A real field, so the unchanged-file skip carries over between graph steps.
+    feature_list_digest: bytes = field(default=b'', repr=False)
+    # (time.time_ns(), message) entries, formatted only when progress_log is read.
+    # Lines loaded from the progress file carry no timestamp and are kept verbatim.
+    progress_log_raw: List[Tuple[Optional[int], str]] = field(default_factory=list)
+    progress_file_offset: int = 0  # Bytes of the progress file already loaded into the log
     git_history: List[str] = field(default_factory=list)
     
     # Current session state
@@ -59,37 +107,75 @@ class State:
     warnings: List[str] = field(default_factory=list)
     status: str = "running"  # running, completed, error, stopped
     
-    def load_feature_list_from_json(self, json_content: str):
-        """Load feature list from JSON string"""
+    def __post_init__(self):
+        self._index_features()
+    
+    def _index_features(self):
+        """Build the id lookup and the queue of incomplete features"""
+        self._by_id: Dict[str, Feature] = {f.key: f for f in self.feature_list}
+        self._incomplete: Deque[Feature] = deque(f for f in self.feature_list if not f.passes)
+    
+    def load_feature_list_from_json(self, json_content: Union[str, bytes]):
+        """Load feature list from JSON string or bytes"""
+        content_hash = _content_hash(json_content)
+        if content_hash == self.feature_list_digest:
+            return
         try:
-            data = json.loads(json_content)
-            self.feature_list = [Feature(**feature_dict) for feature_dict in data]
+            data = orjson.loads(json_content)
+            # Reuse already-loaded features whose entry hasn't changed instead of rebuilding them
+            previous = self._by_id
+            self.feature_list = [
+                _reuse_feature(previous.get(feature_dict.get('id') or feature_dict.get('description')), feature_dict)
+                for feature_dict in data
+            ]
+            self._index_features()
             self.total_features = len(self.feature_list)
             self.completed_features = sum(1 for f in self.feature_list if f.passes)
-        except json.JSONDecodeError as e:
+            self.feature_list_digest = content_hash
+        except orjson.JSONDecodeError as e:
             self.errors.append(f"Failed to parse feature_list.json: {str(e)}")
         except Exception as e:
             self.errors.append(f"Error loading feature list: {str(e)}")
     
+    def mark_feature_list_synced(self, json_content: Union[str, bytes]):
+        """Record that the in-memory feature list (after in-place updates) matches `json_content`"""
+        self.feature_list_digest = _content_hash(json_content)
+    
     def get_next_incomplete_feature(self) -> Optional[Feature]:
         """Get the next feature that hasn't been completed yet"""
-        for feature in self.feature_list:
-            if not feature.passes:
-                return feature
-        return None
+        # Features completed out of order are dropped lazily once they reach the head
+        while self._incomplete and self._incomplete[0].passes:
+            self._incomplete.popleft()
+        return self._incomplete[0] if self._incomplete else None
+    
+    def all_features_complete(self) -> bool:
+        """O(1) check, from the completion counters, that every loaded feature passes"""
+        return self.total_features > 0 and self.completed_features >= self.total_features
+    
+    def get_incomplete_features(self, limit: int) -> List[Feature]:
+        """Get up to `limit` features that haven't been completed yet, in order"""
+        return list(islice((f for f in self._incomplete if not f.passes), limit))
     
     def mark_feature_complete(self, feature_id: str):
         """Mark a specific feature as complete"""
-        for feature in self.feature_list:
-            if feature.id == feature_id or feature.description.startswith(feature_id[:50]):  # Partial match for ID
-                feature.passes = True
-                self.completed_features += 1
-                break
+        feature = self._by_id.get(feature_id)
+        if feature and not feature.passes:
+            feature.passes = True
+            self.completed_features += 1
     
     def add_progress_log(self, message: str):
         """Add a message to the progress log"""
-        timestamp = datetime.now().isoformat()
-        self.progress_log.append(f"[{timestamp}] {message}")
+        self.progress_log_raw.append((time.time_ns(), message))
+    
+    @property
+    def progress_log(self) -> List[str]:
+        """The progress log as formatted lines"""
+        return self.get_progress_log()
+    
+    def get_progress_log(self, last: Optional[int] = None) -> List[str]:
+        """Format the progress log, optionally only the `last` entries"""
+        entries = self.progress_log_raw if last is None else self.progress_log_raw[-last:]
+        return [_format_progress_entry(timestamp_ns, message) for timestamp_ns, message in entries]
     
     def get_completion_percentage(self) -> float:
         """Get the percentage of completed features"""
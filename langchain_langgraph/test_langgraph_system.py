@@ -1,9 +1,16 @@
+import asyncio
+import dataclasses
 import os
+import shutil
+import subprocess
+import sys
 import tempfile
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import json
 from pathlib import Path
+import pytest
+from langchain_core.messages import AIMessageChunk
 
 # Import all the components we need to test
 from langchain_langgraph.config import Config
@@ -16,8 +23,8 @@ from langchain_langgraph.tools import (
     PuppeteerNavigateTool,
     get_all_tools
 )
-from langchain_langgraph.agents import InitializerAgent, CoderAgent
-from langchain_langgraph.workflow import create_initial_state, run_autonomous_development
+from langchain_langgraph.agents import InitializerAgent, CoderAgent, batched_stream
+from langchain_langgraph.workflow import DevelopmentWorkflow, create_initial_state, run_autonomous_development
 from langchain_langgraph.prompts import (
     INITIALIZER_AGENT_PROMPT,
     CODER_AGENT_PROMPT
@@ -36,6 +43,24 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.model_name, "local-20b-model")
         self.assertEqual(config.context_window, 8192)
 
+    def test_config_from_env_engine_and_base_url(self):
+        """Test the base URL comes from the engine only when LLM_BASE_URL is unset"""
+        with patch.dict(os.environ, {"LLM_ENGINE": "lmstudio"}):
+            os.environ.pop("LLM_BASE_URL", None)
+            self.assertEqual(Config.from_env().llm_base_url, "http://localhost:1234/v1")
+
+        with patch.dict(os.environ, {"LLM_ENGINE": "tgi", "LLM_BASE_URL": "http://x/v1"}):
+            self.assertEqual(Config.from_env().llm_base_url, "http://x/v1")
+
+        with patch.dict(os.environ, {"LLM_ENGINE": "tgi"}):
+            os.environ.pop("LLM_BASE_URL", None)
+            with self.assertRaisesRegex(ValueError, "LLM engine 'tgi'"):
+                Config.from_env()
+
+        # Constructing Config directly resolves the URL from the engine too
+        self.assertEqual(Config(llm_engine="lmstudio").llm_base_url, "http://localhost:1234/v1")
+        self.assertEqual(Config(llm_engine="lmstudio", llm_base_url="http://x/v1").llm_base_url, "http://x/v1")
+
 
 class TestState(unittest.TestCase):
     """Test state management"""
@@ -60,21 +85,79 @@ class TestState(unittest.TestCase):
         self.assertEqual(state.total_features, 5)
         self.assertEqual(state.max_attempts, 50)
 
+    def test_feature_list_progression(self):
+        """Test next-feature selection and completion tracking"""
+        state = State(agent_type="coder")
+        state.load_feature_list_from_json(json.dumps([
+            {"category": "functional", "description": "First feature", "steps": [], "passes": True},
+            {"category": "functional", "description": "Second feature", "steps": []},
+            {"category": "style", "description": "Third feature", "steps": [], "id": "f3"},
+        ]))
+        self.assertEqual(state.completed_features, 1)
+        self.assertEqual(state.get_next_incomplete_feature().description, "Second feature")
+
+        # Completing out of order must not skip the head of the queue
+        state.mark_feature_complete("f3")
+        self.assertEqual(state.get_next_incomplete_feature().description, "Second feature")
+
+        self.assertFalse(state.all_features_complete())
+        state.mark_feature_complete("Second feature")
+        state.mark_feature_complete("Second feature")  # Already complete - not counted twice
+        self.assertIsNone(state.get_next_incomplete_feature())
+        self.assertEqual(state.completed_features, 3)
+        self.assertTrue(state.all_features_complete())
+
+    def test_feature_list_reload_skipped_when_unchanged(self):
+        """Test reloading identical feature list content is a no-op"""
+        content = json.dumps([{"category": "functional", "description": "Only feature", "steps": []}])
+        state = State(agent_type="coder")
+        state.load_feature_list_from_json(content)
+        features = state.feature_list
+
+        state.load_feature_list_from_json(content.encode("utf-8"))
+        self.assertIs(state.feature_list, features)
+
+    def test_feature_indexes_are_not_state_fields(self):
+        """Test the feature indexes stay out of the LangGraph schema and are rebuilt on construction"""
+        field_names = {f.name for f in dataclasses.fields(State)}
+        self.assertFalse(any(name.startswith("_") for name in field_names))
+
+        # LangGraph hands nodes a fresh State built from the field values
+        state = State(agent_type="coder")
+        state.load_feature_list_from_json(json.dumps([
+            {"category": "functional", "description": "Done", "steps": [], "passes": True},
+            {"category": "functional", "description": "Todo", "steps": []},
+        ]))
+        rebuilt = State(**{name: getattr(state, name) for name in field_names})
+        # The digest survives the rebuild, so an unchanged file is still not re-parsed
+        features = rebuilt.feature_list
+        rebuilt.load_feature_list_from_json(json.dumps([
+            {"category": "functional", "description": "Done", "steps": [], "passes": True},
+            {"category": "functional", "description": "Todo", "steps": []},
+        ]))
+        self.assertIs(rebuilt.feature_list, features)
+        self.assertEqual(rebuilt.get_next_incomplete_feature().description, "Todo")
+        rebuilt.mark_feature_complete("Todo")
+        self.assertIsNone(rebuilt.get_next_incomplete_feature())
+
+    def test_progress_log(self):
+        """Test progress log entries are timestamped when read"""
+        state = State(agent_type="coder")
+        state.add_progress_log("Started")
+        state.progress_log_raw.append((None, "line from claude-progress.txt"))
+        state.add_progress_log("Finished")
+
+        log = state.progress_log
+        self.assertEqual(len(log), 3)
+        self.assertTrue(log[0].startswith("[") and log[0].endswith("] Started"))
+        self.assertEqual(log[1], "line from claude-progress.txt")
+        self.assertEqual(state.get_progress_log(last=1), [log[2]])
+
 
+@pytest.mark.usefixtures("class_config")
 class TestFileTools(unittest.TestCase):
     """Test file operation tools"""
     
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        # Create a config object for the tools
-        self.config = Config()
-        self.config.project_dir = self.test_dir
-        
-    def tearDown(self):
-        # Clean up test directory
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
     def test_file_read_tool(self):
         """Test FileReadTool"""
         # Create a test file
@@ -104,54 +187,138 @@ class TestFileTools(unittest.TestCase):
         with open(file_path, 'r') as f:
             saved_content = f.read()
         self.assertEqual(saved_content, content)
+    
+    def test_file_read_tool_sees_writes(self):
+        """Test FileReadTool does not serve stale cached content after a write"""
+        read_tool = FileReadTool(config=self.config)
+        write_tool = FileWriteTool(config=self.config)
+        write_tool._run("cached.txt", "first")
+        self.assertEqual(read_tool._run("cached.txt"), "first")
+        
+        write_tool._run("cached.txt", "again")  # Same size, possibly same mtime
+        self.assertEqual(read_tool._run("cached.txt"), "again")
+    
+    def test_file_read_tool_sees_external_rewrites(self):
+        """Test a same-size rewrite by another writer, with the mtime kept, is not served stale"""
+        path = os.path.join(self.test_dir, "external.txt")
+        Path(path).write_text("aaaa")
+        read_tool = FileReadTool(config=self.config)
+        self.assertEqual(read_tool._run("external.txt"), "aaaa")
+
+        # Like `sed -i`: write a new file and rename it over the old one
+        stat = os.stat(path)
+        Path(path + ".new").write_text("bbbb")
+        os.utime(path + ".new", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(path + ".new", path)
+        self.assertEqual(read_tool._run("external.txt"), "bbbb")
+
+    def test_file_cache_is_bounded_by_bytes(self):
+        """Test the file cache evicts least recently used files beyond its byte limit"""
+        from langchain_langgraph import tools
+        read_tool = FileReadTool(config=self.config)
+        paths = []
+        for name in ("lru_a.txt", "lru_b.txt", "lru_c.txt"):
+            Path(self.test_dir, name).write_text("x" * 10)
+            paths.append(Path(self.test_dir, name))
+
+        with patch.object(tools, "_FILE_CACHE_MAX_BYTES", 25), patch.object(tools, "_FILE_CACHE", tools.OrderedDict()), \
+                patch.object(tools, "_file_cache_bytes", 0):
+            for name in ("lru_a.txt", "lru_b.txt", "lru_c.txt"):
+                read_tool._run(name)
+            self.assertEqual(list(tools._FILE_CACHE), paths[1:])
+            self.assertEqual(tools._file_cache_bytes, 20)
+
+            tools.invalidate_file_cache(paths[1])
+            self.assertEqual(tools._file_cache_bytes, 10)
+
+    def test_file_read_tool_truncates_large_files(self):
+        """Test FileReadTool only returns the first max_bytes of a large file"""
+        with open(os.path.join(self.test_dir, "large.txt"), 'w') as f:
+            f.write("x" * 100)
+        
+        tool = FileReadTool(config=self.config, max_bytes=10)
+        self.assertEqual(tool._run("large.txt"), "x" * 10 + "\n...[truncated]")
+    
+    def test_file_write_tool_recreates_removed_dir(self):
+        """Test FileWriteTool recreates a directory removed after its first write"""
+        tool = FileWriteTool(config=self.config)
+        tool._run("nested/dir/a.txt", "a")
+        shutil.rmtree(os.path.join(self.test_dir, "nested"))
+        
+        result = tool._run("nested/dir/b.txt", "b")
+        self.assertIn("Successfully wrote to", result)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "nested", "dir", "b.txt")))
 
 
+@pytest.mark.usefixtures("class_config")
 class TestBashCommand(unittest.TestCase):
     """Test bash command execution"""
     
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        self.config = Config()
-        self.config.project_dir = self.test_dir
-        
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
-    def test_bash_tool_success(self):
+    @patch("langchain_langgraph.tools.subprocess.run")
+    def test_bash_tool_success(self, mock_run):
         """Test executing a successful bash command"""
+        mock_run.return_value = Mock(stdout="Hello World\n", stderr="", returncode=0)
+        tool = BashTool(config=self.config)
+        result = tool._run("cat 'hello world.txt'")
+        self.assertEqual(result, "Hello World\n")
+        self.assertEqual(mock_run.call_args.args[0], ["cat", "hello world.txt"])
+        self.assertFalse(mock_run.call_args.kwargs["shell"])
+        self.assertEqual(mock_run.call_args.kwargs["cwd"], self.test_dir)
+    
+    @patch("langchain_langgraph.tools.subprocess.run")
+    def test_bash_tool_builtins(self, mock_run):
+        """Test trivial commands are answered without spawning a shell"""
         tool = BashTool(config=self.config)
-        result = tool._run("echo 'Hello World'")
-        self.assertTrue("Hello World" in result)
+        self.assertEqual(tool._run("echo 'Hello World'"), "Hello World\n")
+        self.assertEqual(tool._run("pwd"), os.path.realpath(self.test_dir) + "\n")
+        self.assertEqual(tool._run("true"), "")
+        mock_run.assert_not_called()
+        
+        # Anything needing shell syntax still goes to the shell
+        mock_run.return_value = Mock(stdout="", stderr="", returncode=0)
+        tool._run("echo $HOME > home.txt")
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args.args[0], "echo $HOME > home.txt")
+        self.assertTrue(mock_run.call_args.kwargs["shell"])
     
-    def test_bash_tool_failure(self):
+    @patch("langchain_langgraph.tools.subprocess.run")
+    def test_bash_tool_failure(self, mock_run):
         """Test executing a failing bash command"""
+        mock_run.return_value = Mock(
+            stdout="",
+            stderr="ls: cannot access '/nonexistent/directory': No such file or directory",
+            returncode=2
+        )
         tool = BashTool(config=self.config)
         result = tool._run("ls /nonexistent/directory")
+        self.assertIn("STDERR: ls: cannot access", result)
+        self.assertIn("EXIT CODE: 2", result)
+    
+    @pytest.mark.integration
+    def test_bash_tool_runs_real_shell(self):
+        """Smoke test BashTool against a real shell"""
+        tool = BashTool(config=self.config)
+        self.assertIn("Hello World", tool._run("printf 'Hello World'"))
+        result = tool._run("ls /nonexistent/directory")
         self.assertTrue("No such file or directory" in result or "cannot access" in result.lower())
+        
+        # Shell builtins that aren't executables fall back to the shell
+        self.assertEqual(tool._run("cd . && printf ok"), "ok")
+        self.assertEqual(tool._run("export FOO=bar"), "")
 
 
+# The git repo in test_dir is initialized once for the class
+@pytest.mark.usefixtures("class_git_repo", "class_config")
 class TestGitCommand(unittest.TestCase):
     """Test git command execution"""
     
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        self.config = Config()
-        self.config.project_dir = self.test_dir
-        # Initialize a git repo in the test directory
-        os.system(f"cd {self.test_dir} && git init > /dev/null 2>&1")
-        
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
     def test_git_tool_status(self):
         """Test git status command"""
         tool = GitTool(config=self.config)
         result = tool._run("status")
         # Should return status info
         self.assertIsNotNone(result)
-        self.assertIn("On branch", result)
+        self.assertIn("On branch main", result)
     
     def test_git_tool_log(self):
         """Test git log command"""
@@ -159,20 +326,20 @@ class TestGitCommand(unittest.TestCase):
         result = tool._run("log", n=5)
         # Should return log or empty if no commits
         self.assertIsNotNone(result)
+    
+    def test_git_tool_initializes_missing_repo(self):
+        """Test GitTool initializes a repository on first use"""
+        project_dir = os.path.join(self.test_dir, "fresh_project")
+        tool = GitTool(config=dataclasses.replace(self.config, project_dir=project_dir))
+        result = tool._run("status")
+        self.assertIn("On branch", result)
+        self.assertTrue(os.path.isdir(os.path.join(project_dir, ".git")))
 
 
+@pytest.mark.usefixtures("class_config")
 class TestBrowserAutomation(unittest.TestCase):
     """Test browser automation tool"""
     
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        self.config = Config()
-        self.config.project_dir = self.test_dir
-        
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
     def test_puppeteer_navigate_tool(self):
         """Test puppeteer navigate tool"""
         tool = PuppeteerNavigateTool(config=self.config)
@@ -180,89 +347,18 @@ class TestBrowserAutomation(unittest.TestCase):
         self.assertTrue("Navigated to https://example.com" in result)
 
 
-
-
-
-class TestWorkflow(unittest.TestCase):
-    """Test workflow creation"""
-    
-    def test_create_workflow(self):
-        """Test workflow creation"""
-        workflow = create_workflow()
-        
-        # Check that workflow has the expected nodes
-        nodes = workflow.get_graph().nodes
-        self.assertIn("initializer", nodes)
-        self.assertIn("coder", nodes)
-        self.assertIn("get_your_bearings", nodes)
-        
-        # Check that workflow has the expected edges
-        edges = workflow.get_graph().edges
-        self.assertTrue(len(edges) > 0)
-
-
-class TestPrompts(unittest.TestCase):
-    """Test prompt templates"""
-    
-    def test_prompts_exist(self):
-        """Test that all required prompts exist"""
-        self.assertIsInstance(INITIALIZER_PROMPT, str)
-        self.assertIsInstance(CODER_PROMPT, str)
-        self.assertIsInstance(GET_YOUR_BEARINGS_PROMPT, str)
-        
-        # Check that prompts contain expected placeholders
-        self.assertTrue("{specification}" in INITIALIZER_PROMPT)
-        self.assertTrue("{current_feature}" in CODER_PROMPT)
-        self.assertTrue("{project_dir}" in GET_YOUR_BEARINGS_PROMPT)
-
-
-class TestIntegration(unittest.TestCase):
-    """Integration tests for the complete system"""
-    
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
-    def test_complete_workflow(self):
-        """Test a basic workflow execution"""
-        # This is a high-level test that verifies the components can work together
-        state = CodeState(
-            project_dir=self.test_dir,
-            specification="Test specification",
-            feature_list=["test_feature"],
-            current_feature="test_feature",
-            code_files=[],
-            terminal_output="",
-            messages=["Start test"],
-            completed_features=[],
-            error_count=0,
-            max_errors=5
-        )
-        
-        # Verify state was created correctly
-        self.assertEqual(state.project_dir, self.test_dir)
-        self.assertEqual(state.specification, "Test specification")
-        self.assertEqual(len(state.feature_list), 1)
-
-
+@pytest.mark.usefixtures("class_config")
 class TestAgents(unittest.TestCase):
     """Test agent classes"""
     
     def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        self.config = Config()
-        self.config.project_dir = self.test_dir
-        
         # Create some tools for the agents
-        from langchain_langgraph.tools import get_all_tools
         self.tools = get_all_tools(self.config)
-    
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        
+        # Stub out the LLM client - these tests never talk to a model
+        llm_patcher = patch("langchain_langgraph.agents._get_llm", return_value=(Mock(), Mock()))
+        llm_patcher.start()
+        self.addCleanup(llm_patcher.stop)
     
     def test_initializer_agent_creation(self):
         """Test InitializerAgent creation"""
@@ -280,7 +376,9 @@ class TestAgents(unittest.TestCase):
         self.assertEqual(agent.agent_type, "coder")
         self.assertEqual(len(agent.tools), len(self.tools))
     
-    def test_initializer_agent_methods(self):
+    @patch.object(GitTool, "_run", return_value="")
+    @patch.object(InitializerAgent, "get_bearings", side_effect=lambda state: state)
+    def test_initializer_agent_methods(self, mock_get_bearings, mock_git_run):
         """Test InitializerAgent methods"""
         agent = InitializerAgent(self.config, self.tools)
         
@@ -296,8 +394,12 @@ class TestAgents(unittest.TestCase):
         # Test execute_initialization method
         final_state = agent.execute_initialization(updated_state)
         self.assertIsNotNone(final_state)
+        mock_get_bearings.assert_called_once()
+        self.assertEqual([c.args[0] for c in mock_git_run.call_args_list], ["add", "commit"])
     
-    def test_coder_agent_methods(self):
+    @patch.object(CoderAgent, "start_git_commit")
+    @patch.object(CoderAgent, "get_bearings", side_effect=lambda state: state)
+    def test_coder_agent_methods(self, mock_get_bearings, mock_start_git_commit):
         """Test CoderAgent methods"""
         agent = CoderAgent(self.config, self.tools)
         
@@ -312,6 +414,190 @@ class TestAgents(unittest.TestCase):
         # Test execute_coding_task method
         final_state = agent.execute_coding_task(updated_state)
         self.assertIsNotNone(final_state)
+        mock_get_bearings.assert_called_once()
+
+    def test_plan_next_batch(self):
+        """Test the next incomplete features are planned with one batched LLM call"""
+        config = dataclasses.replace(self.config, feature_batch_size=2, max_concurrency=3)
+        agent = CoderAgent(config, self.tools)
+        agent.llm_with_tools = Mock(abatch=AsyncMock(return_value=["plan A", "plan B"]))
+
+        state = State(agent_type="coder")
+        state.load_feature_list_from_json(json.dumps([
+            {"category": "functional", "description": "Done", "steps": [], "passes": True},
+            {"category": "functional", "description": "Feature A", "steps": ["Step A"]},
+            {"category": "functional", "description": "Feature B", "steps": []},
+            {"category": "functional", "description": "Feature C", "steps": []},
+        ]))
+
+        planned = asyncio.run(agent.plan_next_batch(state))
+
+        agent.llm_with_tools.abatch.assert_awaited_once()
+        prompts = agent.llm_with_tools.abatch.call_args.args[0]
+        self.assertEqual(len(prompts), 2)
+        for prompt in prompts:
+            self.assertIs(prompt[0], CoderAgent.system_message)
+        self.assertIn("Feature A\nStep A", prompts[0][1].content)
+        self.assertEqual(agent.llm_with_tools.abatch.call_args.kwargs["config"], {"max_concurrency": 3})
+        self.assertEqual([(feature.description, output) for feature, output in planned],
+                         [("Feature A", "plan A"), ("Feature B", "plan B")])
+
+    @patch.object(CoderAgent, "start_git_commit")
+    def test_coder_skips_feature_missing_from_file(self, mock_start_git_commit):
+        """Test a feature missing from feature_list.json is not marked complete or synced"""
+        project_dir = os.path.join(self.test_dir, "mismatch_project")
+        os.makedirs(project_dir)
+        on_disk = json.dumps([{"category": "functional", "description": "Other feature", "steps": []}])
+        Path(project_dir, "feature_list.json").write_text(on_disk)
+
+        config = dataclasses.replace(self.config, project_dir=project_dir)
+        agent = CoderAgent(config, get_all_tools(config))
+        state = State(agent_type="coder", project_dir=project_dir)
+        state.load_feature_list_from_json(json.dumps([
+            {"category": "functional", "description": "Renamed feature", "steps": []},
+        ]))
+        state.current_feature_id = state.current_feature_description = "Renamed feature"
+
+        state = agent.execute_coding_task(state)
+        self.assertEqual(state.completed_features, 0)
+        self.assertFalse(state.feature_list[0].passes)
+        self.assertEqual(Path(project_dir, "feature_list.json").read_text(), on_disk)
+        self.assertTrue(any("not found in feature_list.json" in line for line in state.progress_log))
+
+        # The stale in-memory list is replaced on the next load of the file
+        state.load_feature_list_from_json(on_disk)
+        self.assertEqual(state.feature_list[0].description, "Other feature")
+
+    def test_get_bearings_merges_results_and_failures(self):
+        """Test the concurrent bearings reads with real tools, a missing file and failing git calls"""
+        project_dir = os.path.join(self.test_dir, "bearings_project")
+        os.makedirs(project_dir)
+        subprocess.run(["git", "init", "-q", project_dir], check=True)
+        Path(project_dir, "app_spec.txt").write_text("Build a chat app")
+        Path(project_dir, "claude-progress.txt").write_text("session 1\nsession 2\n")
+        # feature_list.json is deliberately missing
+
+        config = dataclasses.replace(self.config, project_dir=project_dir)
+        agent = CoderAgent(config, get_all_tools(config))
+        # A background commit with nothing staged - it fails, and must be reported before the reads start
+        agent._pending_git.append(("Empty commit", subprocess.Popen(
+            ["git", "commit", "-q", "-m", "Empty commit"], cwd=project_dir,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )))
+
+        state = State(agent_type="coder", project_dir=project_dir)
+        with patch.object(GitTool, "_run", side_effect=RuntimeError("git unavailable")):
+            state = agent.get_bearings(state)
+
+        log = state.progress_log
+        commit_index = next(i for i, line in enumerate(log) if "Git commit result: Git operation failed" in line)
+        start_index = next(i for i, line in enumerate(log) if "Starting bearings routine" in line)
+        self.assertLess(commit_index, start_index)
+        self.assertEqual(agent._pending_git, [])
+
+        self.assertEqual(state.app_spec, "Build a chat app")
+        self.assertEqual(state.feature_list, [])
+        self.assertTrue(any("feature_list.json" in error for error in state.errors))
+        self.assertIn("session 1", log)
+        self.assertIn("session 2", log)
+        self.assertTrue(any(line.endswith("Could not get git history: git unavailable") for line in log))
+        self.assertEqual(state.git_history, [])
+
+    def test_read_progress_tail(self):
+        """Test the progress log is read incrementally by complete lines and reset on truncation"""
+        project_dir = os.path.join(self.test_dir, "progress_project")
+        os.makedirs(project_dir)
+        progress_path = Path(project_dir, "claude-progress.txt")
+        agent = CoderAgent(dataclasses.replace(self.config, project_dir=project_dir), self.tools)
+
+        self.assertIsNone(agent._read_progress_tail(0))
+
+        progress_path.write_bytes(b"first\nsec")
+        lines, offset = agent._read_progress_tail(0)
+        self.assertEqual((lines, offset), (["first"], 6))
+
+        # The partial line is picked up whole once it is finished
+        with open(progress_path, "ab") as f:
+            f.write(b"ond\nthird\n")
+        lines, offset = agent._read_progress_tail(offset)
+        self.assertEqual(lines, ["second", "third"])
+        self.assertEqual(agent._read_progress_tail(offset), ([], offset))
+
+        # A shorter file means it was replaced - read it from the start
+        progress_path.write_bytes(b"new\n")
+        self.assertEqual(agent._read_progress_tail(offset), (["new"], 4))
+
+    @patch.dict(os.environ, {
+        "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+    })
+    def test_start_git_commit_commits_new_files(self):
+        """Test the background commit initializes the repo and includes newly created files"""
+        project_dir = os.path.join(self.test_dir, "commit_project")
+        config = dataclasses.replace(self.config, project_dir=project_dir)
+        tools = get_all_tools(config)
+        agent = CoderAgent(config, tools)
+        state = State(agent_type="coder", project_dir=project_dir)
+
+        FileWriteTool(config=config)._run("src/app.py", "print('hello')\n")
+        agent.start_git_commit(state, "Add app")
+        agent.wait_for_git(state)
+
+        self.assertTrue(os.path.isdir(os.path.join(project_dir, ".git")))
+        self.assertIn("Git commit result: Committed with message: Add app", state.progress_log[-1])
+        status = subprocess.run(["git", "status", "--porcelain"], cwd=project_dir,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(status.stdout, "")
+        files = subprocess.run(["git", "ls-files"], cwd=project_dir,
+                               capture_output=True, text=True, check=True)
+        self.assertEqual(files.stdout.split(), ["src/app.py"])
+
+        # Back-to-back commits must not race on the index lock
+        FileWriteTool(config=config)._run("src/a.py", "a = 1\n")
+        agent.start_git_commit(state, "Add a")
+        FileWriteTool(config=config)._run("src/b.py", "b = 2\n")
+        agent.start_git_commit(state, "Add b")
+        agent.wait_for_git(state)
+        # Staging runs in the background, so b.py may already land in the "Add a" commit
+        self.assertTrue(any("Committed with message: Add a" in line for line in state.progress_log))
+        self.assertFalse(any("index.lock" in line for line in state.progress_log))
+        files = subprocess.run(["git", "ls-files"], cwd=project_dir,
+                               capture_output=True, text=True, check=True)
+        self.assertEqual(sorted(files.stdout.split()), ["src/a.py", "src/app.py", "src/b.py"])
+
+        # Without a GitTool there is nothing to commit with
+        agent = CoderAgent(config, [tool for tool in tools if not isinstance(tool, GitTool)])
+        agent.start_git_commit(state, "Skipped")
+        self.assertEqual(agent._pending_git, [])
+
+    def test_batched_stream(self):
+        """Test streamed chunks are merged into batches"""
+        async def tokens():
+            for i in range(5):
+                yield AIMessageChunk(content=str(i))
+
+        async def collect():
+            return [chunk async for chunk in batched_stream(tokens(), max_tokens=2, max_ms=10_000)]
+
+        batches = asyncio.run(collect())
+        self.assertEqual([b.content for b in batches], ["01", "23", "4"])
+
+    def test_batched_stream_flushes_during_stall(self):
+        """Test buffered chunks are flushed at the deadline while the stream is stalled"""
+        async def tokens():
+            yield AIMessageChunk(content="a")
+            await asyncio.sleep(0.5)  # e.g. the model is busy with a tool call
+            yield AIMessageChunk(content="b")
+
+        async def collect():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            return [(chunk.content, loop.time() - started)
+                    async for chunk in batched_stream(tokens(), max_tokens=10, max_ms=20)]
+
+        batches = asyncio.run(collect())
+        self.assertEqual([content for content, _ in batches], ["a", "b"])
+        self.assertLess(batches[0][1], 0.4)
 
 
 class TestWorkflow(unittest.TestCase):
@@ -325,11 +611,21 @@ class TestWorkflow(unittest.TestCase):
         self.assertEqual(state.agent_type, "initializer")
         self.assertEqual(state.project_dir, "/tmp/test")
     
+    def test_workflow_graph_nodes(self):
+        """Test each agent turn is a single graph node"""
+        with patch("langchain_langgraph.agents._get_llm", return_value=(Mock(), Mock())):
+            workflow = DevelopmentWorkflow(Config(project_dir="/tmp/test"))
+        
+        nodes = workflow.graph.get_graph().nodes
+        self.assertIn("initializer_step", nodes)
+        self.assertIn("coder_step", nodes)
+        self.assertNotIn("coder_plan", nodes)
+    
+    @pytest.mark.slow
     def test_run_autonomous_development(self):
         """Test run_autonomous_development function"""
         # This is a basic test to ensure the function can be called
-        config = Config()
-        config.project_dir = tempfile.mkdtemp()
+        config = Config(project_dir=tempfile.mkdtemp())
         
         # We can't fully test this function without mocking the LLM,
         # but we can test that it exists and can be called
@@ -354,20 +650,13 @@ class TestPrompts(unittest.TestCase):
         self.assertTrue("{current_feature}" in CODER_AGENT_PROMPT or "{feature_description}" in CODER_AGENT_PROMPT)
 
 
+@pytest.mark.usefixtures("class_test_dir")
 class TestIntegration(unittest.TestCase):
     """Integration tests for the complete system"""
     
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
     def test_complete_tool_set(self):
         """Test that all tools can be created together"""
-        config = Config()
-        config.project_dir = self.test_dir
+        config = Config(project_dir=self.test_dir)
         
         # Get all tools
         tools = get_all_tools(config)
@@ -385,11 +674,22 @@ class TestIntegration(unittest.TestCase):
             self.assertIn(expected_tool, tool_names)
         
         self.assertEqual(len(tools), len(expected_tools))
+    
+    def test_tool_set_cached_per_config(self):
+        """Test that tools are built once per config value"""
+        tools = get_all_tools(Config(project_dir=self.test_dir))
+        again = get_all_tools(Config(project_dir=self.test_dir))
+        other = get_all_tools(Config(project_dir=os.path.join(self.test_dir, "other")))
+        
+        self.assertIsNot(tools, again)
+        self.assertTrue(all(a is b for a, b in zip(tools, again)))
+        self.assertIsNot(tools[0], other[0])
 
 
 if __name__ == "__main__":
     print("Running Langgraph System Tests...")
     print("=" * 50)
     
-    # Run all tests
-    unittest.main(verbosity=2)
\ No newline at end of file
+    # The canonical entry point is run_tests.py at the repository root, which
+    # shards the TestCase classes across cores-2 workers; this is equivalent.
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -4,27 +4,89 @@ These tools will be available to both initializer and coder agents
 """
 import os
 import json
+import re
+import shlex
 import subprocess
 import tempfile
-from typing import Dict, List, Any, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Set, Tuple, Union
 from pathlib import Path
-import git
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
-from config import Config
+from .config import Config
+
+if TYPE_CHECKING:
+    import git
+
+# Repo objects per project directory, so GitPython only bootstraps each repository once
+_REPO_CACHE: Dict[str, "git.Repo"] = {}
+
+# full path -> (stat signature, content) for recently read files, least recently used first.
+# The signature is (st_mtime_ns, st_ctime_ns, st_ino, st_size): the inode and ctime catch
+# rewrites by other writers (e.g. `sed -i` through BashTool) within the same mtime tick.
+_FILE_CACHE: "OrderedDict[Path, Tuple[Tuple[int, int, int, int], str]]" = OrderedDict()
+# Total file size the cache may hold, evicting least recently used files beyond it
+_FILE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_file_cache_bytes = 0
+# Agents read files from worker threads
+_FILE_CACHE_LOCK = threading.Lock()
+
+def _stat_signature(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    """The stat fields that change whenever a file's content may have changed"""
+    return (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino, stat.st_size)
+
+def invalidate_file_cache(full_path: Union[str, Path]):
+    """Drop a file's cached content after writing it"""
+    global _file_cache_bytes
+    with _FILE_CACHE_LOCK:
+        entry = _FILE_CACHE.pop(Path(full_path), None)
+        if entry is not None:
+            _file_cache_bytes -= entry[0][3]
+
+# Directories already created by the tools, so repeated writes skip the makedirs walk
+_ENSURED_DIRS: Set[Path] = set()
+
+def ensure_dir(path: Union[str, Path], refresh: bool = False):
+    """Create a directory (and parents) unless this process already has"""
+    path = Path(path)
+    if refresh or path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
 
 class FileReadTool(BaseTool):
     """Tool to read file contents"""
     name = "file_read"
     description = "Read the contents of a file"
     config: Config = Field(default_factory=Config)
+    # Larger files are truncated to this many bytes
+    max_bytes: int = 1_000_000
     
     def _run(self, filepath: str) -> str:
         """Read a file's contents"""
         try:
-            full_path = os.path.join(self.config.project_dir, filepath)
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            full_path = self.config.project_root / filepath
+            
+            stat = full_path.stat()
+            if stat.st_size > self.max_bytes:
+                # Only read and decode the head of large files; a multi-byte
+                # character cut at the boundary is replaced rather than failing
+                # (not cached - the cut depends on this tool's max_bytes)
+                with open(full_path, 'rb') as f:
+                    head = f.read(self.max_bytes)
+                return head.decode('utf-8', errors='replace') + "\n...[truncated]"
+            
+            # Serve unchanged files from the cache - a stat is much cheaper than a read
+            signature = _stat_signature(stat)
+            with _FILE_CACHE_LOCK:
+                cached = _FILE_CACHE.get(full_path)
+                if cached is not None and cached[0] == signature:
+                    _FILE_CACHE.move_to_end(full_path)
+                    return cached[1]
+            
+            content = full_path.read_text(encoding='utf-8')
+            _cache_file(full_path, signature, content)
             return content
         except FileNotFoundError:
             return f"File not found: {filepath}"
@@ -34,6 +96,19 @@ class FileReadTool(BaseTool):
     async def _arun(self, filepath: str):
         raise NotImplementedError("FileReadTool does not support async")
 
+def _cache_file(full_path: Path, signature: Tuple[int, int, int, int], content: str):
+    """Cache a file's content, evicting least recently used files to stay within the byte limit"""
+    global _file_cache_bytes
+    with _FILE_CACHE_LOCK:
+        previous = _FILE_CACHE.pop(full_path, None)
+        if previous is not None:
+            _file_cache_bytes -= previous[0][3]
+        _FILE_CACHE[full_path] = (signature, content)
+        _file_cache_bytes += signature[3]
+        while _file_cache_bytes > _FILE_CACHE_MAX_BYTES and len(_FILE_CACHE) > 1:
+            _, (evicted_signature, _) = _FILE_CACHE.popitem(last=False)
+            _file_cache_bytes -= evicted_signature[3]
+
 class FileWriteTool(BaseTool):
     """Tool to write content to a file"""
     name = "file_write"
@@ -43,11 +118,16 @@ class FileWriteTool(BaseTool):
     def _run(self, filepath: str, content: str) -> str:
         """Write content to a file"""
         try:
-            full_path = os.path.join(self.config.project_dir, filepath)
+            full_path = self.config.project_root / filepath
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            ensure_dir(full_path.parent)
+            try:
+                full_path.write_text(content, encoding='utf-8')
+            except FileNotFoundError:
+                # The directory was removed since we created it
+                ensure_dir(full_path.parent, refresh=True)
+                full_path.write_text(content, encoding='utf-8')
+            invalidate_file_cache(full_path)
             return f"Successfully wrote to {filepath}"
         except Exception as e:
             return f"Error writing file {filepath}: {str(e)}"
@@ -55,6 +135,9 @@ class FileWriteTool(BaseTool):
     async def _arun(self, filepath: str, content: str):
         raise NotImplementedError("FileWriteTool does not support async")
 
+# Characters that need a real shell to interpret (pipes, redirects, expansions, globs, ...)
+_SHELL_METACHARS = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n]")
+
 class BashTool(BaseTool):
     """Tool to execute bash commands"""
     name = "bash_command"
@@ -63,15 +146,19 @@ class BashTool(BaseTool):
     
     def _run(self, command: str) -> str:
         """Execute a bash command"""
+        args = self._split_command(command)
+        if args is not None:
+            builtin_output = self._run_builtin(args)
+            if builtin_output is not None:
+                return builtin_output
+        
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=self.config.project_dir,
-                capture_output=True,
-                text=True,
-                timeout=30  # 30 second timeout
-            )
+            try:
+                # Plain commands are exec'd directly, saving the intermediate /bin/sh
+                result = self._spawn(args, shell=False) if args is not None else self._spawn(command, shell=True)
+            except FileNotFoundError:
+                # Not an executable on PATH (e.g. a shell builtin like cd or export)
+                result = self._spawn(command, shell=True)
             output = result.stdout
             if result.stderr:
                 output += f"\nSTDERR: {result.stderr}"
@@ -83,6 +170,48 @@ class BashTool(BaseTool):
         except Exception as e:
             return f"Error executing command: {str(e)}"
     
+    def _spawn(self, command: Union[str, List[str]], shell: bool) -> subprocess.CompletedProcess:
+        """Run a command in the project directory"""
+        return subprocess.run(
+            command,
+            shell=shell,
+            cwd=self.config.project_dir,
+            capture_output=True,
+            text=True,
+            timeout=30  # 30 second timeout
+        )
+    
+    @staticmethod
+    def _split_command(command: str) -> Optional[List[str]]:
+        """
+        Split a command into argv if it can run without a shell.
+        Returns None when it needs shell syntax, such as pipes, redirects,
+        expansions, globs or leading VAR=value assignments.
+        """
+        if _SHELL_METACHARS.search(command):
+            return None
+        try:
+            args = shlex.split(command)
+        except ValueError:
+            # Unbalanced quotes - let the shell report it
+            return None
+        if not args or "=" in args[0]:
+            return None
+        return args
+    
+    def _run_builtin(self, args: List[str]) -> Optional[str]:
+        """
+        Answer trivial commands (plain echo, pwd, true) without spawning a process.
+        Returns None for anything else.
+        """
+        if args[0] == "echo" and not (len(args) > 1 and args[1].startswith("-")):
+            return " ".join(args[1:]) + "\n"
+        if args == ["pwd"]:
+            return os.path.realpath(self.config.project_dir) + "\n"
+        if args == ["true"]:
+            return ""
+        return None
+    
     async def _arun(self, command: str):
         raise NotImplementedError("BashTool does not support async")
 
@@ -96,18 +225,22 @@ class GitTool(BaseTool):
         """Perform git operations"""
         try:
             repo_path = self.config.project_dir
-            # Initialize git repo if it doesn't exist
-            if not os.path.exists(os.path.join(repo_path, '.git')):
-                git.Repo.init(repo_path)
-            
-            repo = git.Repo(repo_path)
             
+            # Read-only queries go straight to the git CLI
             if operation == "status":
-                return repo.git.status()
+                self._get_repo(repo_path)
+                return self._git(repo_path, "status")
             elif operation == "log":
+                self._get_repo(repo_path)
                 n = kwargs.get("n", 10)
-                return repo.git.log("--oneline", f"-{n}")
-            elif operation == "add":
+                return self._git(repo_path, "log", "--oneline", f"-{n}")
+            elif operation == "diff":
+                self._get_repo(repo_path)
+                return self._git(repo_path, "diff")
+            
+            repo = self._get_repo(repo_path)
+            
+            if operation == "add":
                 files = kwargs.get("files", ".")
                 repo.git.add(files)
                 return f"Added {files} to staging"
@@ -115,13 +248,38 @@ class GitTool(BaseTool):
                 message = kwargs.get("message", "Auto-commit")
                 repo.git.commit("-m", message)
                 return f"Committed with message: {message}"
-            elif operation == "diff":
-                return repo.git.diff()
             else:
                 return f"Unknown git operation: {operation}"
         except Exception as e:
             return f"Git operation failed: {str(e)}"
     
+    @staticmethod
+    def _get_repo(repo_path: str) -> "git.Repo":
+        """Return the cached Repo for a path, initializing the repository if needed"""
+        repo = _REPO_CACHE.get(repo_path)
+        if repo is None:
+            # GitPython is slow to import, so only load it once a git tool is actually used
+            import git
+            
+            # Open the repo, initializing it if it doesn't exist - this is the only
+            # check, later calls for the same path go straight to the cache
+            try:
+                repo = git.Repo(repo_path)
+            except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+                repo = git.Repo.init(repo_path)
+            _REPO_CACHE[repo_path] = repo
+        return repo
+    
+    @staticmethod
+    def _git(repo_path: str, *args: str) -> str:
+        """Run a git command and return its output, raising on failure like GitPython"""
+        result = subprocess.run(["git", *args], cwd=repo_path,
+                                capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            import git
+            raise git.GitCommandError(["git", *args], result.returncode, result.stderr)
+        return result.stdout.rstrip("\n")
+    
     async def _arun(self, operation: str, **kwargs):
         raise NotImplementedError("GitTool does not support async")
 
@@ -151,7 +309,7 @@ class PuppeteerScreenshotTool(BaseTool):
         # In a real implementation, this would use puppeteer
         # For now, we'll simulate the functionality
         screenshot_path = os.path.join(self.config.screenshot_dir, filename)
-        os.makedirs(self.config.screenshot_dir, exist_ok=True)
+        ensure_dir(self.config.screenshot_dir)
         # This would actually take a screenshot in a real implementation
         return f"Screenshot saved to {screenshot_path} (simulated)"
     
@@ -188,9 +346,10 @@ class PuppeteerFillTool(BaseTool):
     async def _arun(self, selector: str, text: str):
         raise NotImplementedError("PuppeteerFillTool does not support async")
 
-def get_all_tools(config: Config) -> List[BaseTool]:
-    """Get all tools for the agents"""
-    return [
+@lru_cache(maxsize=8)
+def _build_tools(config: Config) -> Tuple[BaseTool, ...]:
+    """Construct the tool set for a config (Config is frozen, so it is a safe cache key)"""
+    return (
         FileReadTool(config=config),
         FileWriteTool(config=config),
         BashTool(config=config),
@@ -199,4 +358,8 @@ def get_all_tools(config: Config) -> List[BaseTool]:
         PuppeteerScreenshotTool(config=config),
         PuppeteerClickTool(config=config),
         PuppeteerFillTool(config=config),
-    ]
\ No newline at end of file
+    )
+
+def get_all_tools(config: Config) -> List[BaseTool]:
+    """Get all tools for the agents"""
+    return list(_build_tools(config))
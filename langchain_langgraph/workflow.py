@@ -9,6 +9,7 @@ from .state import State
 from .agents import InitializerAgent, CoderAgent
 from .tools import get_all_tools
 from .config import Config
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,12 +20,13 @@ class DevelopmentWorkflow:
     """
     def __init__(self, config: Config):
         self.config = config
-        self.tools = get_all_tools(config)
+        # Build the tools and their executor once and share them between both agents
+        self.tools = tuple(get_all_tools(config))
         self.tool_executor = ToolExecutor(self.tools)
         
         # Create agents
-        self.initializer_agent = InitializerAgent(config, self.tools)
-        self.coder_agent = CoderAgent(config, self.tools)
+        self.initializer_agent = InitializerAgent(config, self.tools, self.tool_executor)
+        self.coder_agent = CoderAgent(config, self.tools, self.tool_executor)
         
         # Build the graph
         self.graph = self._build_graph()
@@ -36,60 +38,72 @@ class DevelopmentWorkflow:
         # Create state graph
         workflow = StateGraph(State)
         
-        # Add nodes for each agent action
-        workflow.add_node("initializer_plan", self.initializer_agent.plan_initialization)
-        workflow.add_node("initializer_execute", self.initializer_agent.execute_initialization)
-        workflow.add_node("coder_plan", self.coder_agent.plan_coding_session)
-        workflow.add_node("coder_execute", self.coder_agent.execute_coding_task)
+        # One node per agent turn - plan and execute always run back to back,
+        # so fusing them halves the graph steps per feature
+        workflow.add_node("initializer_step", self._initializer_step)
+        workflow.add_node("coder_step", self._coder_step)
         
         # Set entry point
-        workflow.set_entry_point("initializer_plan")
+        workflow.set_entry_point("initializer_step")
         
         # Define transitions
-        # Initializer transitions
-        workflow.add_edge("initializer_plan", "initializer_execute")
-        workflow.add_edge("initializer_execute", "coder_plan")
+        workflow.add_edge("initializer_step", "coder_step")
         
-        # Coder transitions
-        workflow.add_edge("coder_plan", "coder_execute")
-        
-        # Conditional edge from coder_execute back to itself or to end
+        # Conditional edge from coder_step back to itself or to end
         workflow.add_conditional_edges(
-            "coder_execute",
+            "coder_step",
             self._should_continue,
             {
-                "continue": "coder_plan",  # Continue coding if more features
+                "continue": "coder_step",  # Continue coding if more features
                 "end": END  # End if all features are complete
             }
         )
         
         return workflow.compile()
     
+    def _initializer_step(self, state: State) -> State:
+        """
+        Plan and execute the project initialization
+        """
+        state = self.initializer_agent.plan_initialization(state)
+        return self.initializer_agent.execute_initialization(state)
+    
+    def _coder_step(self, state: State) -> State:
+        """
+        Plan and execute one coding session, then settle whether the workflow is done.
+        The status is decided here rather than in _should_continue because changes a
+        routing function makes to the state are not written back to the graph.
+        """
+        state = self.coder_agent.plan_coding_session(state)
+        state = self.coder_agent.execute_coding_task(state)
+        state.attempt_count += 1
+        
+        if state.status == "running":
+            # Check if there are more incomplete features - the counters answer this
+            # without touching the feature queue once everything has passed
+            if state.all_features_complete() or state.get_next_incomplete_feature() is None:
+                state.status = "completed"
+            # Check attempt count to prevent infinite loops
+            elif state.attempt_count >= state.max_attempts:
+                state.status = "stopped"
+        return state
+    
     def _should_continue(self, state: State) -> Literal["continue", "end"]:
         """
         Determine if the workflow should continue or end
         """
-        # Check if all features are completed
         if state.status == "completed":
             logger.info("All features completed, ending workflow")
             return "end"
         
-        # Check attempt count to prevent infinite loops
-        if state.attempt_count >= state.max_attempts:
+        if state.status == "stopped":
             logger.info(f"Max attempts ({state.max_attempts}) reached, ending workflow")
-            state.status = "stopped"
             return "end"
         
-        # Check if there are more incomplete features
-        next_feature = state.get_next_incomplete_feature()
-        if next_feature is None:
-            logger.info("No more incomplete features, ending workflow")
-            state.status = "completed"
+        if state.status != "running":
+            logger.info(f"Workflow status is {state.status}, ending workflow")
             return "end"
         
-        # Increment attempt count
-        state.attempt_count += 1
-        
         logger.info(f"Continuing workflow, attempt {state.attempt_count}/{state.max_attempts}")
         return "continue"
     
@@ -102,6 +116,9 @@ class DevelopmentWorkflow:
         # Execute the workflow
         final_state = self.graph.invoke(initial_state)
         
+        # Let the final feature's background commit finish
+        self.coder_agent.wait_for_git()
+        
         logger.info("Development workflow completed")
         return final_state
 
@@ -109,8 +126,6 @@ def create_initial_state(agent_type: str = "initializer", project_dir: str = "./
     """
     Create an initial state for the workflow
     """
-    from datetime import datetime
-    
     return State(
         agent_type=agent_type,
         project_dir=project_dir,
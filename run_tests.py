@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Run the Langgraph system test suite sharded across cores-2 workers.
+
+The sharding options live in langchain_langgraph/pytest.ini (-n auto with
+--dist=loadscope, so each TestCase class stays on one worker), and conftest.py
+makes -n auto leave two cores free for the LLM inference process.
+"""
+import os
+import sys
+
+import pytest
+
+TEST_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "langchain_langgraph", "test_langgraph_system.py")
+
+
+def main(argv=None) -> int:
+    return pytest.main([TEST_MODULE] + list(argv if argv is not None else sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
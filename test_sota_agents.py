@@ -5,133 +5,229 @@ This script will simulate the system's response to the prompt and extract implem
 """
 
 import os
-import json
-from datetime import datetime
+import sys
+from datetime import date
+from itertools import count
+from pathlib import Path
+from types import MappingProxyType
+
+import orjson
+
+# Where the report files are written
+OUTPUT_DIR = Path("/workspace")
+MARKDOWN_PATH = OUTPUT_DIR / "sota_implementation_points.md"
+JSON_PATH = OUTPUT_DIR / "sota_implementation_points.json"
+
+# Today's date (YYYY-MM-DD), computed once at import; isoformat() skips strftime's format parsing
+_TODAY = date.today().isoformat()
+
+# The SOTA methods are stored as parallel tuples (one per field) so the formatters can
+# zip over just the fields they need instead of indexing a dict per field per method.
+
+# Method names
+_METHODS = (
+    "Multi-Agent Systems with Specialized Roles",
+    "LangGraph/State Machine Based Agents",
+    "Self-Reflection and Tool Usage",
+    "Memory-Augmented Agents",
+    "Tool-Integrated Agents",
+    "Hierarchical Task Decomposition",
+    "Verification-Driven Development",
+    "Multi-Modal Integration",
+)
+
+# What each method is
+_DESCRIPTIONS = (
+    "Systems that employ multiple agents with distinct roles (e.g., researcher, planner, implementer, tester) working in coordination.",
+    "Agents that use graph-based state machines to manage complex workflows and decision-making processes.",
+    "Agents that can introspect their own performance, use external tools, and adjust behavior based on feedback.",
+    "Agents that maintain both short-term working memory and long-term memory for context preservation.",
+    "Agents that can dynamically use various tools (code editors, search engines, testing frameworks) to accomplish tasks.",
+    "Agents that break down complex goals into hierarchical subtasks and manage execution of these components.",
+    "Agents that continuously verify their work against requirements and test cases.",
+    "Agents that can process different types of input (text, images, audio) and generate multi-modal outputs.",
+)
+
+# How each method relates to our system
+_IMPLEMENTATION_NOTES = (
+    "Our current system already implements a two-agent system (Initializer and Coder) which aligns with this approach.",
+    "Our system already uses LangGraph for workflow management, which is a SOTA approach.",
+    "Our 'Get Your Bearings' routine implements a form of self-reflection by checking project state.",
+    "Our State class maintains progress logs, git history, and feature status - forms of memory.",
+    "Our system includes FileRead, FileWrite, Git, Browser, and other tools for agent use.",
+    "Our system decomposes projects into feature lists and handles each feature as a subtask.",
+    "Our system uses feature_list.json with pass/fail tracking for verification.",
+    "Currently not implemented but could be added with screenshot and image analysis tools.",
+)
+
+# Recommended next steps for our system
+_RECOMMENDATIONS = (
+    "Enhance the current tool set with more sophisticated debugging and testing tools",
+    "Implement a more robust memory system with context window management",
+    "Add support for agent collaboration and code review processes",
+    "Integrate external knowledge bases and documentation search capabilities",
+    "Implement self-correction mechanisms based on test results",
+    "Add multi-modal capabilities for UI/UX development",
+    "Create a plugin system for adding new tools and capabilities",
+    "Implement better error recovery and fallback strategies",
+)
+
+# The report content is static, so it is built once at import instead of on every call.
+# It is shared by every caller, so it is read-only all the way down (mappings wrapped in
+# MappingProxyType, tuples in place of lists). It can never drift from the field tuples
+# above, which the cached bullets, console blocks and markdown are formatted from.
+# sota_methods keeps the sequence-of-dicts shape for JSON export and external callers.
+_REPORT_TEMPLATE = MappingProxyType({
+    "title": "Research Report: State-of-the-Art Methods for Creating AI Agents",
+    "date": _TODAY,
+    "executive_summary": "This report analyzes the current state-of-the-art methods for creating AI agents, focusing on practical implementation approaches that can be integrated into autonomous development systems.",
+    "sota_methods": tuple(
+        MappingProxyType({"method": method, "description": description, "implementation_notes": notes})
+        for method, description, notes in zip(_METHODS, _DESCRIPTIONS, _IMPLEMENTATION_NOTES)
+    ),
+    "implementation_recommendations": _RECOMMENDATIONS,
+})
 
 def simulate_sota_agent_report():
     """
     Simulate a research report on SOTA methods for creating AI agents.
     This represents what our system might generate if it were actually running with a large language model.
+    The report is built once at import, so every call returns the same read-only object.
+    """
+    return _REPORT_TEMPLATE
+
+# List item prefixes and the name/note separator, shared by every formatted line
+_BULLET = "• "
+_DASH = "- "
+_SEP = ": "
+
+# Console block for one method: (number, name, description, notes).
+# The trailing newline gives the blank line between methods.
+_format_method = "{}. {}\n   Description: {}\n   Implementation Notes: {}\n".format
+
+# (console bullets, markdown method items, markdown recommendation items) for
+# _REPORT_TEMPLATE, built on first use
+_POINTS_CACHE = None
+
+def _template_points():
     """
-    report = {
-        "title": "Research Report: State-of-the-Art Methods for Creating AI Agents",
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "executive_summary": "This report analyzes the current state-of-the-art methods for creating AI agents, focusing on practical implementation approaches that can be integrated into autonomous development systems.",
-        "sota_methods": [
-            {
-                "method": "Multi-Agent Systems with Specialized Roles",
-                "description": "Systems that employ multiple agents with distinct roles (e.g., researcher, planner, implementer, tester) working in coordination.",
-                "implementation_notes": "Our current system already implements a two-agent system (Initializer and Coder) which aligns with this approach."
-            },
-            {
-                "method": "LangGraph/State Machine Based Agents",
-                "description": "Agents that use graph-based state machines to manage complex workflows and decision-making processes.",
-                "implementation_notes": "Our system already uses LangGraph for workflow management, which is a SOTA approach."
-            },
-            {
-                "method": "Self-Reflection and Tool Usage",
-                "description": "Agents that can introspect their own performance, use external tools, and adjust behavior based on feedback.",
-                "implementation_notes": "Our 'Get Your Bearings' routine implements a form of self-reflection by checking project state."
-            },
-            {
-                "method": "Memory-Augmented Agents",
-                "description": "Agents that maintain both short-term working memory and long-term memory for context preservation.",
-                "implementation_notes": "Our State class maintains progress logs, git history, and feature status - forms of memory."
-            },
-            {
-                "method": "Tool-Integrated Agents",
-                "description": "Agents that can dynamically use various tools (code editors, search engines, testing frameworks) to accomplish tasks.",
-                "implementation_notes": "Our system includes FileRead, FileWrite, Git, Browser, and other tools for agent use."
-            },
-            {
-                "method": "Hierarchical Task Decomposition",
-                "description": "Agents that break down complex goals into hierarchical subtasks and manage execution of these components.",
-                "implementation_notes": "Our system decomposes projects into feature lists and handles each feature as a subtask."
-            },
-            {
-                "method": "Verification-Driven Development",
-                "description": "Agents that continuously verify their work against requirements and test cases.",
-                "implementation_notes": "Our system uses feature_list.json with pass/fail tracking for verification."
-            },
-            {
-                "method": "Multi-Modal Integration",
-                "description": "Agents that can process different types of input (text, images, audio) and generate multi-modal outputs.",
-                "implementation_notes": "Currently not implemented but could be added with screenshot and image analysis tools."
-            }
-        ],
-        "implementation_recommendations": [
-            "Enhance the current tool set with more sophisticated debugging and testing tools",
-            "Implement a more robust memory system with context window management",
-            "Add support for agent collaboration and code review processes",
-            "Integrate external knowledge bases and documentation search capabilities",
-            "Implement self-correction mechanisms based on test results",
-            "Add multi-modal capabilities for UI/UX development",
-            "Create a plugin system for adding new tools and capabilities",
-            "Implement better error recovery and fallback strategies"
-        ]
-    }
-    return report
+    Get the formatted points of the static simulated report, formatting them on first use.
+    """
+    global _POINTS_CACHE
+    if _POINTS_CACHE is None:
+        _POINTS_CACHE = _format_points(_METHODS, _IMPLEMENTATION_NOTES, _RECOMMENDATIONS)
+    return _POINTS_CACHE
 
 def extract_implementable_bullet_points(report):
     """
-    Extract bullet points from the report that we can implement in our system.
+    Extract bullet points from the report that we can implement in our system, as a tuple.
+    The static simulated report is read-only and always gives the same bullets, so they are
+    only formatted once and the same tuple is returned on every call.
     """
-    bullet_points = []
+    if report is _REPORT_TEMPLATE:
+        return _template_points()[0]
     
+    methods = report["sota_methods"]
+    return _format_points(
+        [method["method"] for method in methods],
+        [method["implementation_notes"] for method in methods],
+        report["implementation_recommendations"],
+    )[0]
+
+def _format_points(names, notes, recommendations):
+    """
+    Format the console bullet points and the markdown list items in a single pass
+    over parallel sequences of method names and implementation notes.
+    """
+    bullet_points = []
+    method_items = []
     # Add implementation notes from each SOTA method
-    for method in report["sota_methods"]:
-        bullet_points.append(f"• {method['method']}: {method['implementation_notes']}")
+    for name, note in zip(names, notes):
+        bullet_points.append("".join((_BULLET, name, _SEP, note)))
+        method_items.append("".join((_DASH, "**", name, "**", _SEP, note)))
     
     # Add implementation recommendations
     bullet_points.append("")
     bullet_points.append("Implementation Recommendations:")
-    for rec in report["implementation_recommendations"]:
-        bullet_points.append(f"• {rec}")
+    recommendation_items = []
+    for rec in recommendations:
+        bullet_points.append(_BULLET + rec)
+        recommendation_items.append(_DASH + rec)
     
-    return bullet_points
+    return tuple(bullet_points), tuple(method_items), tuple(recommendation_items)
+
+def _render_markdown():
+    """
+    Render the markdown document for the static simulated report.
+    """
+    _, method_items, recommendation_items = _template_points()
+    parts = [
+        "# SOTA Implementation Points for AI Agent System", "",
+        f"Generated on: {_TODAY}", "",
+        "## Current SOTA Methods and Our Implementation Status", "",
+    ]
+    parts += method_items
+    parts += ["", "## Implementation Recommendations", ""]
+    parts += recommendation_items
+    return "\n".join(parts) + "\n"
+
+# Nothing in the markdown report varies after import (the date included), so the
+# encoded document is built once here
+_PAYLOAD_BYTES = _render_markdown().encode("utf-8")
 
-def main():
-    print("Testing the program with prompt: 'Provide a research report on the SOTA method for creating AI agents currently'")
-    print("="*100)
+def main(emit_markdown=True):
+    # Collect the console output and write it in one go instead of one print() per line
+    out = []
+    out.append("Testing the program with prompt: 'Provide a research report on the SOTA method for creating AI agents currently'")
+    out.append("="*100)
     
     # Simulate the report generation
     report = simulate_sota_agent_report()
     
     # Display the report
-    print(f"Title: {report['title']}")
-    print(f"Date: {report['date']}")
-    print(f"Summary: {report['executive_summary']}")
-    print("\nSOTA Methods Analyzed:")
-    print("-" * 50)
+    out.append(f"Title: {report['title']}")
+    out.append(f"Date: {report['date']}")
+    out.append(f"Summary: {report['executive_summary']}")
+    out.append("\nSOTA Methods Analyzed:")
+    out.append("-" * 50)
     
-    for i, method in enumerate(report["sota_methods"], 1):
-        print(f"{i}. {method['method']}")
-        print(f"   Description: {method['description']}")
-        print(f"   Implementation Notes: {method['implementation_notes']}")
-        print()
+    # One string per method from a template parsed once
+    out += map(_format_method, count(1), _METHODS, _DESCRIPTIONS, _IMPLEMENTATION_NOTES)
     
     # Extract and display implementable bullet points
     bullet_points = extract_implementable_bullet_points(report)
-    print("IMPLEMENTABLE BULLET POINTS FOR OUR SYSTEM:")
-    print("="*100)
-    for point in bullet_points:
-        print(point)
+    out.append("IMPLEMENTABLE BULLET POINTS FOR OUR SYSTEM:")
+    out.append("="*100)
+    out.append("\n".join(bullet_points))
     
-    # Save the bullet points to a file
-    with open("/workspace/sota_implementation_points.md", "w") as f:
-        f.write("# SOTA Implementation Points for AI Agent System\n\n")
-        f.write(f"Generated on: {report['date']}\n\n")
-        f.write("## Current SOTA Methods and Our Implementation Status\n\n")
-        for method in report["sota_methods"]:
-            f.write(f"- **{method['method']}**: {method['implementation_notes']}\n")
-        
-        f.write("\n## Implementation Recommendations\n\n")
-        for rec in report["implementation_recommendations"]:
-            f.write(f"- {rec}\n")
+    # Save the report as JSON - orjson writes the tuples as arrays, and default=dict
+    # unwraps the read-only mapping
+    _write_atomic(JSON_PATH, orjson.dumps(report, default=dict, option=orjson.OPT_INDENT_2))
+    out.append(f"\nSaved report to: {JSON_PATH}")
     
-    print(f"\nSaved implementation points to: /workspace/sota_implementation_points.md")
+    if emit_markdown:
+        _write_markdown()
+        out.append(f"\nSaved implementation points to: {MARKDOWN_PATH}")
     
+    sys.stdout.write("\n".join(out) + "\n")
+    
+    # The report and bullets are shared module-level data, both already read-only
     return report, bullet_points
 
+def _write_markdown():
+    """
+    Save the bullet points of the simulated report to a markdown file.
+    """
+    # The encoded document was built at import
+    _write_atomic(MARKDOWN_PATH, _PAYLOAD_BYTES)
+
+def _write_atomic(path, payload):
+    """
+    Write bytes to a temp file next to `path`, then rename it into place.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
 if __name__ == "__main__":
     report, points = main()
\ No newline at end of file